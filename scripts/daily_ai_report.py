@@ -1,6 +1,12 @@
 import os
+import re
+import argparse
 import time
 import json
+import random
+import hashlib
+import asyncio
+import urllib.parse
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 
@@ -10,7 +16,7 @@ import arxiv
 # 기존의 google.generativeai 패키지가 아니라
 # 신규 Google Gen AI SDK인 google-genai 패키지를 사용합니다.
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 
 
 # ---------------------------------------------------------
@@ -20,6 +26,63 @@ from google.genai import types
 # 기본적으로 gemini-2.5-flash 모델을 사용합니다.
 DEFAULT_MODEL = "gemini-2.5-flash"
 
+# 1차 요약(Map) 단계에서 동시에 보낼 수 있는 최대 Gemini 요청 수입니다.
+# 너무 크게 잡으면 분당 호출량 제한(HTTP 429)에 걸리기 쉽습니다.
+MAX_CONCURRENT_CALLS = 5
+
+# 1차 요약(Map) 단계에서 한 번의 Gemini 요청에 묶어 보낼 자료 수입니다.
+# 여러 자료를 한 프롬프트에 담으면 요청 횟수와 반복되는 지시문이 줄어듭니다.
+# 너무 크게 잡으면 응답이 길어져 JSON이 중간에 끊길 수 있습니다.
+MAP_BATCH_SIZE = 5
+
+# 수집한 자료가 이 개수 이하이면 개별 요약(Map)과 최종 리포트(Reduce)를
+# 나누지 않고 한 번의 Gemini 호출로 리포트를 생성합니다.
+# 자료가 많아 프롬프트가 길어지는 경우에는 자동으로 2단계 방식을 사용합니다.
+# (현재 main()은 뉴스·논문을 각각 최대 5건만 수집하므로 자동 전환은 일어나지 않으며,
+#  2단계 방식은 --two-phase로 지정할 때만 사용됩니다.)
+ONE_SHOT_MAX_ITEMS = 10
+
+# Gemini 재시도 설정입니다.
+# 대기 시간은 0 ~ min(최대값, 기본값 × 2^(시도 횟수 - 1)) 사이에서
+# 무작위로 정합니다(full jitter). 여러 요청이 동시에 실패해도
+# 같은 시점에 다시 몰리지 않습니다.
+#
+# 일반 오류는 4, 8, 16, 32, 60초 순으로 상한이 늘어납니다.
+# 429(분당 쿼터 초과)는 1분 단위 쿼터가 풀릴 때까지 기다릴 수 있도록
+# 15, 30, 60, 60, 60초로 더 빨리 최대값에 도달하며,
+# 서버가 재시도 시간(RetryInfo.retryDelay)을 알려주면 그 값을 우선 사용합니다.
+RETRY_MAX_ATTEMPTS = 6
+RETRY_BASE_DELAY = 4.0
+RATE_LIMIT_BASE_DELAY = 15.0
+RETRY_MAX_DELAY = 60.0
+
+# 재시도할 HTTP 상태 코드입니다.
+# 429는 호출량·쿼터 제한(RESOURCE_EXHAUSTED),
+# 5xx는 일시적 서버 오류입니다.
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 검색 결과 디스크 캐시 설정입니다.
+# 로컬 디버깅이나 같은 작업 공간에서 재실행할 때 같은 검색을 반복하면
+# DDGS 호출량 제한에 걸리기 쉬우므로, 일정 시간 안에 같은 검색을 하면
+# 저장된 결과를 재사용합니다.
+# 캐시 폴더는 커밋하지 않으므로 매번 새로 체크아웃하는
+# GitHub Actions 실행 사이에서는 재사용되지 않습니다.
+CACHE_DIR = Path("reports")
+DDG_CACHE_DIR = CACHE_DIR / ".ddg_cache"
+ARXIV_CACHE_DIR = CACHE_DIR / ".arxiv_cache"
+SEARCH_CACHE_TTL_SECONDS = 6 * 60 * 60
+
+# 개별 자료 요약 캐시입니다.
+# 같은 자료는 요약 결과가 바뀌지 않으므로 만료 시간 없이 재사용합니다.
+# 검색 캐시와 마찬가지로 같은 작업 공간 안의 재실행에서만 효과가 있습니다.
+SUMMARY_CACHE_DIR = CACHE_DIR / ".summary_cache"
+
+# 최종 리포트가 끊긴 경우 이어쓰기를 시도할 최대 횟수와
+# 첫 이어쓰기에 전달할 기존 글의 끝부분 길이입니다.
+# 이어쓰기를 반복할수록 전달하는 길이를 두 배씩 늘립니다.
+MAX_CONTINUATIONS = 2
+CONTINUE_TAIL_CHARS = 1500
+
 
 # ---------------------------------------------------------
 # 1) 고정 포맷 템플릿
@@ -76,6 +139,38 @@ REPORT_TEMPLATE = """# [AI Daily] {target_date} 기술 동향
 """
 
 
+# 최종 리포트 생성 프롬프트의 출력 규칙입니다.
+# 2단계 방식과 단일 호출 방식이 같은 규칙을 사용합니다.
+REPORT_RULES = """[출력 규칙]
+1. 아래 템플릿의 섹션과 헤더 이름을 그대로 사용한다.
+
+2. 오늘의 Top 이슈는
+   수집된 자료 중 3~5개를 선정한다.
+
+3. 동일한 자료를 여러 이슈에서 반복하지 않는다.
+
+4. 각 이슈는 반드시 다음 구조를 포함한다.
+   - 요약: 불릿 3~5개
+   - 개발자 관점 한 줄 평: 1문장
+   - 지금 바로 적용 아이디어: 1~3개
+   - 리스크/주의: 1~2개
+   - 참고 링크: 실제 원문 링크 1~2개
+
+5. 마지막에 반드시 다음 섹션을 포함한다.
+   - 오늘의 실무 액션 3가지
+   - 원문 목록 (Raw Index)
+
+6. 한국어로만 작성한다.
+
+7. 자료에 없는 사실을 추측하거나 과장하지 않는다.
+
+8. URL을 수정하거나 새로 만들지 않는다.
+
+9. 뉴스 또는 논문이 없는 경우
+   해당 Raw Index에
+   '(수집된 항목 없음)'이라고 표시한다."""
+
+
 # ---------------------------------------------------------
 # 2) Gemini 공용 함수
 # ---------------------------------------------------------
@@ -88,6 +183,9 @@ def choose_model() -> str:
 
     환경변수가 없으면 DEFAULT_MODEL을 사용합니다.
 
+    models.list() 같은 API 조회 없이 환경변수만 읽으므로
+    별도의 결과 캐시가 필요하지 않습니다.
+
     예:
         GEMINI_MODEL=gemini-2.5-flash
     """
@@ -123,83 +221,315 @@ def get_response_text(response) -> str:
     return text.strip()
 
 
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Gemini 호출 오류가 재시도할 만한 일시적 오류인지 판단합니다.
+
+    google-genai의 API 오류(errors.APIError)는
+    HTTP 상태 코드로만 판단합니다.
+    잘못된 요청(400), 인증 오류(401, 403) 등은
+    재시도해도 성공하지 않으므로 즉시 실패시킵니다.
+
+    API 응답을 받기 전에 발생한 네트워크 오류는
+    오류 메시지로 판단합니다.
+    """
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS_CODES
+
+    error_message = str(error).lower()
+
+    return (
+        "timeout" in error_message
+        or "timed out" in error_message
+        or "temporarily unavailable" in error_message
+        or "connection" in error_message
+    )
+
+
+def get_server_retry_delay(error: Exception):
+    """
+    429 오류 응답에 포함된 서버 권장 재시도 시간(초)을 읽습니다.
+
+    Gemini API는 쿼터 초과 시 오류 상세 정보에
+    {"@type": ".../google.rpc.RetryInfo", "retryDelay": "37s"}
+    형태의 값을 넣어 보냅니다. 값이 없으면 None을 반환합니다.
+    """
+    details = getattr(error, "details", None)
+
+    if not isinstance(details, dict):
+        return None
+
+    error_body = details.get("error", details)
+
+    if not isinstance(error_body, dict):
+        return None
+
+    for detail in error_body.get("details") or []:
+        if not isinstance(detail, dict):
+            continue
+
+        retry_delay = detail.get("retryDelay")
+
+        if isinstance(retry_delay, str) and retry_delay.endswith("s"):
+            try:
+                return float(retry_delay[:-1])
+            except ValueError:
+                return None
+
+    return None
+
+
+def get_retry_delay(attempt: int, error: Exception) -> float:
+    """
+    attempt번째 실패 후 기다릴 시간(초)을 계산합니다.
+
+    - 429: 서버 권장 시간이 있으면 그 시간에 작은 무작위 값을 더해 사용하고,
+      없으면 RATE_LIMIT_BASE_DELAY 기준으로 계산합니다.
+    - 그 외: RETRY_BASE_DELAY 기준으로 계산합니다.
+
+    지수적으로 늘어나는 상한 안에서 무작위로 선택합니다(full jitter).
+    """
+    is_rate_limited = (
+        isinstance(error, errors.APIError)
+        and error.code == 429
+    )
+
+    if is_rate_limited:
+        server_delay = get_server_retry_delay(error)
+
+        if server_delay is not None:
+            return (
+                min(server_delay, RETRY_MAX_DELAY)
+                + random.uniform(0, RETRY_BASE_DELAY)
+            )
+
+    base_delay = (
+        RATE_LIMIT_BASE_DELAY
+        if is_rate_limited
+        else RETRY_BASE_DELAY
+    )
+
+    max_delay = min(
+        RETRY_MAX_DELAY,
+        base_delay * (2 ** (attempt - 1)),
+    )
+
+    return random.uniform(0, max_delay)
+
+
+def get_retry_wait(
+    error: Exception,
+    attempt: int,
+    retries: int,
+) -> float:
+    """
+    Gemini 호출이 실패했을 때 재시도 여부를 결정합니다.
+
+    재시도할 경우 기다릴 시간(초)을 반환하고,
+    재시도 대상이 아니거나 최종 재시도까지 실패한 경우
+    원래 예외를 다시 발생시킵니다.
+
+    동기·비동기·스트리밍 호출이 같은 재시도 규칙을 사용하도록
+    판단과 로그 출력을 이 함수 한곳에서 처리합니다.
+    """
+    if not (
+        is_retryable_error(error)
+        and attempt < retries
+    ):
+        raise error
+
+    wait_time = get_retry_delay(attempt, error)
+
+    print(
+        f"⚠️ Gemini 일시 오류: "
+        f"{wait_time:.1f}초 후 재시도 "
+        f"({attempt}/{retries}) | {error}"
+    )
+
+    return wait_time
+
+
+def call_with_retry(
+    request,
+    retries: int = RETRY_MAX_ATTEMPTS,
+):
+    """
+    request()를 호출하고, 일시적 오류가 발생하면 재시도합니다.
+
+    다음과 같은 일시적 오류는 재시도합니다.
+
+    - HTTP 429 (API 호출량·쿼터 제한)
+    - HTTP 500, 502, 503, 504
+    - 네트워크 타임아웃, 연결 오류
+
+    재시도 간격:
+    - 429: 서버 권장 시간(RetryInfo), 없으면
+      0초 ~ min(60초, 15초 × 2^(시도 횟수 - 1)) 사이의 무작위 값
+    - 그 외: 0초 ~ min(60초, 4초 × 2^(시도 횟수 - 1)) 사이의 무작위 값
+    """
+    for attempt in range(1, retries + 1):
+        try:
+            return request()
+
+        except Exception as error:
+            time.sleep(
+                get_retry_wait(error, attempt, retries)
+            )
+
+    raise RuntimeError(
+        "Gemini 호출 재시도 횟수가 0 이하입니다."
+    )
+
+
+async def call_with_retry_async(
+    request,
+    retries: int = RETRY_MAX_ATTEMPTS,
+):
+    """
+    call_with_retry()의 비동기 버전입니다.
+
+    request()가 반환하는 코루틴을 기다리며,
+    재시도 대기 중에도 이벤트 루프가 막히지 않습니다.
+    """
+    for attempt in range(1, retries + 1):
+        try:
+            return await request()
+
+        except Exception as error:
+            await asyncio.sleep(
+                get_retry_wait(error, attempt, retries)
+            )
+
+    raise RuntimeError(
+        "Gemini 호출 재시도 횟수가 0 이하입니다."
+    )
+
+
 def generate_with_retry(
     client,
     model_name: str,
     prompt_text: str,
-    retries: int = 3,
+    retries: int = RETRY_MAX_ATTEMPTS,
     max_output_tokens: int = 4096,
     temperature: float = 0.2,
 ) -> str:
     """
     Gemini에 텍스트 생성을 요청합니다.
 
-    다음과 같은 일시적 오류는 재시도합니다.
+    신규 google-genai SDK에는 모델별 객체(GenerativeModel)가 없고,
+    main()에서 만든 하나의 Client를 모든 호출이 공유합니다.
 
-    - HTTP 429
-    - API 호출량 제한
-    - API 쿼터 제한
-    - HTTP 500, 502, 503, 504
-    - 네트워크 타임아웃
-    - 일시적 서비스 장애
+    재시도 조건과 간격은 call_with_retry()를 따릅니다.
+    """
+    def request():
+        response = client.models.generate_content(
+            model=model_name,
+            contents=prompt_text,
+            config=types.GenerateContentConfig(
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+            ),
+        )
 
-    재시도 간격:
-    - 첫 번째 실패 후 30초
-    - 두 번째 실패 후 60초
+        return get_response_text(response)
+
+    return call_with_retry(
+        request,
+        retries=retries,
+    )
+
+
+async def generate_with_retry_async(
+    client,
+    model_name: str,
+    prompt_text: str,
+    retries: int = RETRY_MAX_ATTEMPTS,
+    max_output_tokens: int = 4096,
+    temperature: float = 0.2,
+) -> str:
     """
-    last_error = None
+    generate_with_retry()의 비동기 버전입니다.
 
-    for attempt in range(1, retries + 1):
-        try:
-            response = client.models.generate_content(
+    client.aio를 사용하므로 대기 중에도 이벤트 루프가 막히지 않아
+    여러 요청을 동시에 진행할 수 있습니다.
+    """
+    async def request():
+        response = await client.aio.models.generate_content(
+            model=model_name,
+            contents=prompt_text,
+            config=types.GenerateContentConfig(
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+            ),
+        )
+
+        return get_response_text(response)
+
+    return await call_with_retry_async(
+        request,
+        retries=retries,
+    )
+
+
+def generate_stream_with_retry(
+    client,
+    model_name: str,
+    prompt_text: str,
+    stream_path: Path,
+    retries: int = RETRY_MAX_ATTEMPTS,
+    max_output_tokens: int = 4096,
+    temperature: float = 0.2,
+) -> str:
+    """
+    Gemini 응답을 스트리밍으로 받으면서
+    도착한 조각을 stream_path에 바로 기록합니다.
+
+    긴 리포트 생성 중에도 디스크 기록이 함께 진행되며,
+    중간에 실패하더라도 stream_path에서 진행 상황을 확인할 수 있습니다.
+
+    스트리밍 도중 일시적 오류가 발생하면
+    stream_path를 비우고 처음부터 다시 요청합니다.
+    재시도 조건과 간격은 call_with_retry()를 따릅니다.
+    """
+    def request():
+        chunks = []
+
+        with stream_path.open(
+            "w",
+            encoding="utf-8",
+        ) as stream_file:
+            for chunk in client.models.generate_content_stream(
                 model=model_name,
                 contents=prompt_text,
                 config=types.GenerateContentConfig(
                     temperature=temperature,
                     max_output_tokens=max_output_tokens,
                 ),
-            )
-
-            return get_response_text(response)
+            ):
+                # 안전 필터 정보만 담긴 조각 등은
+                # text가 비어 있을 수 있습니다.
+                chunk_text = getattr(chunk, "text", None)
 
-        except Exception as error:
-            last_error = error
-
-            # google-genai의 API 오류 객체에는
-            # code 속성이 들어 있는 경우가 있습니다.
-            error_code = getattr(error, "code", None)
-            error_message = str(error).lower()
-
-            retryable = (
-                error_code in {429, 500, 502, 503, 504}
-                or "429" in error_message
-                or "quota" in error_message
-                or "rate limit" in error_message
-                or "resource exhausted" in error_message
-                or "timeout" in error_message
-                or "temporarily unavailable" in error_message
-                or "service unavailable" in error_message
-            )
+                if not chunk_text:
+                    continue
 
-            if retryable and attempt < retries:
-                wait_time = attempt * 30
+                stream_file.write(chunk_text)
+                stream_file.flush()
+                chunks.append(chunk_text)
 
-                print(
-                    f"⚠️ Gemini 일시 오류: "
-                    f"{wait_time}초 후 재시도 "
-                    f"({attempt}/{retries}) | {error}"
-                )
+        text = "".join(chunks)
 
-                time.sleep(wait_time)
-                continue
+        if not text.strip():
+            raise RuntimeError(
+                "Gemini가 비어 있는 응답을 반환했습니다."
+            )
 
-            # 재시도 대상이 아니거나
-            # 최종 재시도까지 실패한 경우 예외를 다시 발생시킵니다.
-            raise
+        return text.strip()
 
-    raise RuntimeError(
-        "Gemini 호출 재시도 횟수를 초과했습니다."
-    ) from last_error
+    return call_with_retry(
+        request,
+        retries=retries,
+    )
 
 
 # ---------------------------------------------------------
@@ -213,10 +543,18 @@ def build_raw_index(items):
     - 원문 링크 누락 방지
     - Gemini가 URL을 임의로 변경하는 문제 방지
     - 실제 수집한 링크만 보고서에 포함
+
+    반환값:
+        (뉴스 목록 텍스트, 논문 목록 텍스트, 뉴스 수, 논문 수)
+
+    목록과 개수를 한 번의 순회로 함께 계산합니다.
     """
     news_lines = []
     paper_lines = []
 
+    append_news = news_lines.append
+    append_paper = paper_lines.append
+
     for item in items:
         title = (item.get("title") or "").strip()
         link = (item.get("link") or "").strip()
@@ -224,20 +562,49 @@ def build_raw_index(items):
         if not title or not link:
             continue
 
-        if item.get("type") == "news":
-            news_lines.append(
+        item_type = item.get("type")
+
+        if item_type == "news":
+            append_news(
                 f"- {title} — {link}"
             )
 
-        elif item.get("type") == "paper":
-            paper_lines.append(
+        elif item_type == "paper":
+            append_paper(
                 f"- {title} — {link}"
             )
 
     return (
         "\n".join(news_lines),
         "\n".join(paper_lines),
+        len(news_lines),
+        len(paper_lines),
+    )
+
+
+# 최종 리포트에 반드시 포함되어야 하는 헤더입니다.
+REQUIRED_HEADERS = [
+    "# [AI Daily]",
+    "## 오늘의 Top 이슈",
+    "## 오늘의 실무 액션 3가지",
+    "## 원문 목록 (Raw Index)",
+    "### 뉴스",
+    "### 논문",
+]
+
+# 모든 필수 헤더를 한 번의 본문 탐색으로 찾기 위한 정규식입니다.
+# "# [AI Daily]"가 "## ..." 헤더의 일부와 겹치지 않도록
+# 긴 헤더를 먼저 시도하게 정렬합니다.
+REQUIRED_HEADERS_PATTERN = re.compile(
+    "|".join(
+        re.escape(header)
+        for header in sorted(
+            REQUIRED_HEADERS,
+            key=len,
+            reverse=True,
+        )
     )
+)
 
 
 def validate_report_format(report_text: str):
@@ -247,54 +614,54 @@ def validate_report_format(report_text: str):
     반환값이 빈 리스트라면
     모든 필수 헤더가 정상적으로 포함된 것입니다.
     """
-    required_headers = [
-        "# [AI Daily]",
-        "## 오늘의 Top 이슈",
-        "## 오늘의 실무 액션 3가지",
-        "## 원문 목록 (Raw Index)",
-        "### 뉴스",
-        "### 논문",
-    ]
+    found_headers = set(
+        REQUIRED_HEADERS_PATTERN.findall(report_text)
+    )
 
     return [
         header
-        for header in required_headers
-        if header not in report_text
+        for header in REQUIRED_HEADERS
+        if header not in found_headers
     ]
 
 
 def looks_truncated(report_text: str) -> bool:
     """
-    Gemini 출력이 중간에 끊겼는지 간단하게 검사합니다.
+    Gemini 출력이 중간에 끊겼는지 구조로 검사합니다.
 
-    다음 조건 중 하나라도 충족하면
+    리포트는 항상 Raw Index 섹션의 뉴스·논문 목록으로 끝나므로,
+    마지막 Raw Index 섹션 뒤에 두 하위 섹션이 모두 없으면
     출력이 중단된 것으로 판단합니다.
-
-    1. 전체 결과가 1,200자 미만
-    2. 마지막 Raw Index 섹션이 없음
     """
-    if len(report_text) < 1200:
-        return True
+    raw_index_start = report_text.rfind(
+        "## 원문 목록 (Raw Index)"
+    )
 
-    if "## 원문 목록 (Raw Index)" not in report_text:
+    if raw_index_start < 0:
         return True
 
-    return False
+    raw_index_text = report_text[raw_index_start:]
+
+    return not (
+        "### 뉴스" in raw_index_text
+        and "### 논문" in raw_index_text
+    )
 
 
 def continue_report(
     client,
     model_name: str,
     existing_text: str,
+    tail_chars: int = CONTINUE_TAIL_CHARS,
 ) -> str:
     """
     최종 리포트가 중간에 끊긴 경우
-    마지막 부분부터 한 번 이어서 작성합니다.
+    마지막 부분부터 이어서 작성합니다.
 
-    기존 리포트 전체가 아니라 마지막 1,500자만 전달하여
+    기존 리포트 전체가 아니라 마지막 tail_chars자만 전달하여
     중복 생성과 추가 토큰 사용을 줄입니다.
     """
-    tail = existing_text[-1500:]
+    tail = existing_text[-tail_chars:]
 
     prompt = f"""
 아래 글은 작성 도중 중단된 AI 기술 동향 리포트다.
@@ -319,7 +686,6 @@ def continue_report(
         client=client,
         model_name=model_name,
         prompt_text=prompt,
-        retries=3,
         max_output_tokens=4096,
         temperature=0.1,
     )
@@ -331,30 +697,58 @@ def continue_report(
     )
 
 
+def normalize_link(link: str) -> str:
+    """
+    중복 비교를 위해 URL을 정규화합니다.
+
+    http/https, www 접두어, 프래그먼트, 경로 끝의 슬래시 차이는
+    같은 문서로 취급합니다.
+    쿼리 문자열은 기사 ID 등을 담는 경우가 있어 그대로 유지합니다.
+    """
+    parsed = urllib.parse.urlparse(
+        link.strip()
+    )
+
+    netloc = parsed.netloc.lower().removeprefix("www.")
+    path = parsed.path.rstrip("/")
+    query = f"?{parsed.query}" if parsed.query else ""
+
+    return f"{netloc}{path}{query}"
+
+
 def deduplicate_items(items):
     """
-    동일한 URL이 여러 번 검색됐을 때
+    같은 자료가 여러 번 수집됐을 때
     첫 번째 항목만 남깁니다.
 
-    URL이 없다면 제목을 보조 중복 기준으로 사용합니다.
+    Gemini 호출 전에 중복을 제거하여
+    중복 자료만큼의 요약 비용을 줄입니다.
+
+    정규화한 URL이 같으면 중복으로 판단합니다.
+    URL이 없는 항목만 같은 타입 안에서
+    공백을 정리한 제목 앞 80자를 보조 중복 기준으로 사용합니다.
     """
     unique_items = []
     seen_keys = set()
 
     for item in items:
-        link = (
+        link = normalize_link(
             item.get("link")
             or ""
-        ).strip().lower()
-
-        title = (
-            item.get("title")
-            or ""
-        ).strip().lower()
+        )
 
-        key = link or title
+        title = " ".join(
+            (
+                item.get("title")
+                or ""
+            ).lower().split()
+        )[:80]
 
-        if not key:
+        if link:
+            key = ("link", link)
+        elif title:
+            key = ("title", item.get("type"), title)
+        else:
             continue
 
         if key in seen_keys:
@@ -366,6 +760,104 @@ def deduplicate_items(items):
     return unique_items
 
 
+def write_text_atomic(path: Path, text: str):
+    """
+    파일을 원자적으로 저장합니다.
+
+    임시 파일에 먼저 기록한 뒤 os.replace()로 교체하므로
+    저장 도중 작업이 중단되어도 반쯤 기록된 파일이 남지 않습니다.
+
+    main()은 결과 파일의 존재 여부로 완료 여부를 판단하므로
+    불완전한 파일이 완료된 것으로 취급되는 일을 막습니다.
+    """
+    tmp_path = path.with_name(
+        path.name + ".tmp"
+    )
+
+    tmp_path.write_text(
+        text,
+        encoding="utf-8",
+    )
+
+    os.replace(tmp_path, path)
+
+
+def get_cache_path(cache_dir: Path, *key_parts) -> Path:
+    """
+    캐시 키 구성 요소를 해시하여 캐시 파일 경로를 만듭니다.
+    """
+    key_text = json.dumps(
+        key_parts,
+        ensure_ascii=False,
+    )
+
+    key_hash = hashlib.blake2b(
+        key_text.encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+
+    return cache_dir / f"{key_hash}.json"
+
+
+def load_cache(cache_path: Path, ttl_seconds=None):
+    """
+    캐시 파일에서 저장된 값을 읽습니다.
+
+    파일이 없거나, 손상됐거나,
+    ttl_seconds보다 오래된 경우에는 None을 반환합니다.
+    ttl_seconds가 None이면 만료 시간 없이 사용합니다.
+    """
+    try:
+        cached = json.loads(
+            cache_path.read_text(encoding="utf-8")
+        )
+
+    except (OSError, ValueError):
+        return None
+
+    # 형식이 다른 캐시 파일도 손상된 파일과 같이 무시합니다.
+    if not isinstance(cached, dict):
+        return None
+
+    if (
+        ttl_seconds is not None
+        and time.time() - cached.get("ts", 0) >= ttl_seconds
+    ):
+        return None
+
+    return cached.get("value")
+
+
+def save_cache(cache_path: Path, value):
+    """
+    값을 저장 시각과 함께 캐시 파일에 기록합니다.
+
+    캐시는 실행 속도를 위한 보조 수단이므로
+    저장에 실패해도 작업을 중단하지 않습니다.
+    """
+    try:
+        cache_path.parent.mkdir(
+            parents=True,
+            exist_ok=True,
+        )
+
+        cache_path.write_text(
+            json.dumps(
+                {
+                    "ts": time.time(),
+                    "value": value,
+                },
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+
+    except OSError as error:
+        print(
+            f"⚠️ 캐시 저장 실패: {error}"
+        )
+
+
 # ---------------------------------------------------------
 # 4) 뉴스 수집
 # ---------------------------------------------------------
@@ -386,6 +878,9 @@ def collect_news(
     검색 서비스가 일시적으로 실패하더라도
     arXiv 논문 수집은 계속 진행할 수 있도록
     뉴스 검색 오류는 이 함수 내부에서 처리합니다.
+
+    같은 검색어의 결과는 SEARCH_CACHE_TTL_SECONDS 동안
+    reports/.ddg_cache에 저장된 값을 재사용합니다.
     """
     if news_n <= 0:
         return []
@@ -395,6 +890,23 @@ def collect_news(
         f"technology news {target_date}"
     )
 
+    cache_path = get_cache_path(
+        DDG_CACHE_DIR,
+        query,
+        news_n,
+    )
+
+    cached_items = load_cache(
+        cache_path,
+        ttl_seconds=SEARCH_CACHE_TTL_SECONDS,
+    )
+
+    if cached_items:
+        print(
+            f"♻️ DDGS 캐시 사용: {len(cached_items)}건"
+        )
+        return cached_items
+
     ddgs = DDGS(timeout=20)
     results = []
 
@@ -482,6 +994,11 @@ def collect_news(
         if len(news_items) >= news_n:
             break
 
+    # 검색 실패로 결과가 비어 있는 경우는
+    # 다음 실행에서 다시 시도하도록 캐시하지 않습니다.
+    if news_items:
+        save_cache(cache_path, news_items)
+
     return news_items
 
 
@@ -503,13 +1020,39 @@ def collect_papers(paper_n: int = 5):
 
         client = arxiv.Client()
         client.results(search)
+
+    같은 날 같은 조건의 검색 결과는 SEARCH_CACHE_TTL_SECONDS 동안
+    reports/.arxiv_cache에 저장된 값을 재사용합니다.
     """
     if paper_n <= 0:
         return []
 
+    query = "(cat:cs.AI OR cat:cs.LG)"
+
+    cache_path = get_cache_path(
+        ARXIV_CACHE_DIR,
+        query,
+        paper_n,
+        datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+    )
+
+    cached_items = load_cache(
+        cache_path,
+        ttl_seconds=SEARCH_CACHE_TTL_SECONDS,
+    )
+
+    if cached_items:
+        print(
+            f"♻️ arXiv 캐시 사용: {len(cached_items)}건"
+        )
+        return cached_items
+
     arxiv_client = arxiv.Client(
         # 한 페이지에서 가져올 결과 수입니다.
-        page_size=max(paper_n, 10),
+        #
+        # 필요한 논문 수만큼만 요청하여
+        # 첫 페이지 한 번으로 수집이 끝나도록 합니다.
+        page_size=paper_n,
 
         # arXiv API에 지나치게 빠르게 요청하지 않도록
         # 요청 사이에 3초 간격을 둡니다.
@@ -522,7 +1065,7 @@ def collect_papers(paper_n: int = 5):
 
     search = arxiv.Search(
         # 인공지능 또는 머신러닝 카테고리를 검색합니다.
-        query="(cat:cs.AI OR cat:cs.LG)",
+        query=query,
 
         max_results=paper_n,
 
@@ -535,6 +1078,10 @@ def collect_papers(paper_n: int = 5):
 
     paper_items = []
 
+    # 같은 논문이 여러 카테고리에 등록되어
+    # 중복으로 반환되는 경우를 제외하기 위한 arXiv ID 목록입니다.
+    seen_entry_ids = set()
+
     try:
         # 핵심 수정 부분입니다.
         #
@@ -544,6 +1091,11 @@ def collect_papers(paper_n: int = 5):
         # 변경:
         # for result in arxiv_client.results(search):
         for result in arxiv_client.results(search):
+            if result.entry_id in seen_entry_ids:
+                continue
+
+            seen_entry_ids.add(result.entry_id)
+
             title = (
                 result.title
                 or ""
@@ -579,10 +1131,13 @@ def collect_papers(paper_n: int = 5):
             f"⚠️ arXiv 논문 수집 실패: {error}"
         )
 
+    if paper_items:
+        save_cache(cache_path, paper_items)
+
     return paper_items
 
 
-def collect_items(
+async def collect_items_async(
     target_date: str,
     news_n: int = 5,
     paper_n: int = 5,
@@ -591,26 +1146,31 @@ def collect_items(
     뉴스와 논문을 함께 수집하고
     중복 항목을 제거합니다.
 
+    DDGS와 arXiv 수집은 서로 독립적인 네트워크 작업이므로
+    각각 별도 스레드에서 동시에 실행합니다.
+    전체 수집 시간은 두 작업 중 더 오래 걸리는 쪽과 비슷해집니다.
+
     뉴스와 arXiv가 모두 실패해서
     자료가 한 건도 없는 경우에는
     근거 없는 보고서를 만들지 않고 작업을 중단합니다.
     """
-    items = []
-
-    items.extend(
-        collect_news(
+    news_items, paper_items = await asyncio.gather(
+        asyncio.to_thread(
+            collect_news,
             target_date=target_date,
             news_n=news_n,
-        )
-    )
-
-    items.extend(
-        collect_papers(
+        ),
+        asyncio.to_thread(
+            collect_papers,
             paper_n=paper_n,
-        )
+        ),
     )
 
-    items = deduplicate_items(items)
+    # 뉴스를 먼저, 논문을 나중에 배치하는
+    # 기존 순서를 유지합니다.
+    items = deduplicate_items(
+        news_items + paper_items
+    )
 
     if not items:
         raise RuntimeError(
@@ -624,22 +1184,11 @@ def collect_items(
 # ---------------------------------------------------------
 # 6) Map: 개별 자료 구조화 요약
 # ---------------------------------------------------------
-def map_summaries(
-    client,
-    model_name: str,
-    items,
-):
+def build_summary_prompt(item) -> str:
     """
-    수집한 뉴스와 논문을 한 건씩
-    Gemini에 전달하여 구조화된 요약을 생성합니다.
+    자료 한 건을 구조화 요약하기 위한 프롬프트를 만듭니다.
     """
-    summaries = []
-
-    for index, item in enumerate(
-        items,
-        start=1,
-    ):
-        item_text = f"""
+    item_text = f"""
 [타입] {item['type']}
 [제목] {item['title']}
 [본문]
@@ -647,7 +1196,7 @@ def map_summaries(
 [링크] {item['link']}
 """.strip()
 
-        summary_prompt = f"""
+    return f"""
 너는 시니어 개발자 관점의 AI 뉴스·논문 분석가다.
 
 아래 자료만 근거로 한국어 구조화 요약을 작성하라.
@@ -671,69 +1220,347 @@ def map_summaries(
 {item_text}
 """.strip()
 
+
+def build_batch_prompt(indexed_items) -> str:
+    """
+    여러 자료를 한 번에 구조화 요약하기 위한 프롬프트를 만듭니다.
+
+    indexed_items는 (idx, item) 튜플 목록이며,
+    각 자료는 [ITEM idx] 블록으로 구분합니다.
+
+    응답은 코드에서 바로 읽을 수 있도록
+    JSON 배열 형식으로만 출력하게 합니다.
+    """
+    item_blocks = "\n\n".join(
+        f"""
+[ITEM {index}]
+[타입] {item['type']}
+[제목] {item['title']}
+[본문]
+{item['body']}
+[링크] {item['link']}
+""".strip()
+        for index, item in indexed_items
+    )
+
+    return f"""
+너는 시니어 개발자 관점의 AI 뉴스·논문 분석가다.
+
+아래 자료 각각에 대해, 해당 자료만 근거로 한국어 구조화 요약을 작성하라.
+
+자료에 없는 내용을 추측하거나 과장하지 말고,
+원문 링크는 수정하지 말고 그대로 유지하라.
+
+[summary_text 형식]
+- 제목:
+- 분류: 뉴스 또는 논문
+- 핵심 키워드: 중복 없는 단어 3개
+- 핵심 포인트:
+  - 첫 번째 핵심 내용
+  - 두 번째 핵심 내용
+  - 세 번째 핵심 내용
+- 기술 스택 태그:
+- 개발자 관점 한 줄 평:
+- 참고 링크:
+
+[출력 규칙]
+1. 다른 설명 없이 JSON 배열만 출력한다.
+2. 각 원소는 다음 키를 가진다.
+   {{"idx": ITEM 번호, "title": 제목, "link": 링크, "summary_text": 위 형식의 요약}}
+3. 모든 ITEM에 대해 정확히 하나의 원소를 출력한다.
+
+[분석할 자료]
+{item_blocks}
+""".strip()
+
+
+def parse_json_response(text: str):
+    """
+    Gemini 응답에서 JSON을 읽습니다.
+
+    모델이 지시와 달리 ```json 코드 블록으로 감싸서
+    응답하는 경우가 있어 코드 펜스를 먼저 제거합니다.
+    """
+    text = text.strip()
+
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rstrip()
+        text = text.removesuffix("```")
+
+    return json.loads(text)
+
+
+def get_summary_cache_path(model_name: str, item) -> Path:
+    """
+    자료의 제목·본문·링크와 모델 이름으로
+    요약 캐시 파일 경로를 만듭니다.
+
+    내용이 조금이라도 바뀐 자료는 다시 요약합니다.
+    """
+    return get_cache_path(
+        SUMMARY_CACHE_DIR,
+        model_name,
+        item["title"],
+        item["body"],
+        item["link"],
+    )
+
+
+async def map_summaries_async(
+    client,
+    model_name: str,
+    items,
+    max_concurrent_calls: int = MAX_CONCURRENT_CALLS,
+    batch_size: int = MAP_BATCH_SIZE,
+):
+    """
+    수집한 뉴스와 논문을
+    Gemini에 전달하여 구조화된 요약을 생성합니다.
+
+    자료를 batch_size개씩 묶어 한 번의 요청으로 요약하고,
+    묶음끼리는 서로 독립적이므로 동시에 실행합니다.
+    세마포어로 동시 요청 수를 max_concurrent_calls 이하로 제한하여
+    호출량 제한에 걸리지 않도록 합니다.
+
+    묶음 응답을 JSON으로 읽지 못하면 해당 묶음만 한 건씩 요약하고,
+    응답에서 일부 항목만 빠졌다면 빠진 항목만 한 건씩 요약합니다.
+
+    요약 결과는 자료 내용 기준으로 reports/.summary_cache에 저장하여
+    같은 작업 공간에서 재실행할 때 재사용합니다.
+    (캐시 폴더는 커밋하지 않으므로 새로 체크아웃하는 CI 실행 사이에는 유지되지 않습니다.)
+
+    결과는 완료 순서와 관계없이 원래 items 순서를 유지합니다.
+    """
+    semaphore = asyncio.Semaphore(
+        max(1, max_concurrent_calls)
+    )
+
+    batch_size = max(1, batch_size)
+
+    indexed_items = list(
+        enumerate(
+            items,
+            start=1,
+        )
+    )
+
+    def to_summary(index, item, summary_text):
+        # 제목과 링크는 모델 출력이 아니라
+        # 실제 수집한 값을 그대로 사용합니다.
+        return {
+            "idx": index,
+            "type": item["type"],
+            "title": item["title"],
+            "link": item["link"],
+            "summary_text": summary_text,
+        }
+
+    # 이전 실행에서 이미 요약한 자료는 캐시된 요약을 사용하고
+    # 나머지 자료만 Gemini에 요청합니다.
+    cached_summaries = []
+    pending_items = []
+
+    for index, item in indexed_items:
+        cached_text = load_cache(
+            get_summary_cache_path(model_name, item)
+        )
+
+        if cached_text:
+            cached_summaries.append(
+                to_summary(index, item, cached_text)
+            )
+        else:
+            pending_items.append((index, item))
+
+    if cached_summaries:
         print(
-            f"🧩 1차 요약 진행: "
-            f"{index}/{len(items)}"
+            f"♻️ 요약 캐시 사용: "
+            f"{len(cached_summaries)}/{len(items)}건"
         )
 
-        summary_text = generate_with_retry(
-            client=client,
-            model_name=model_name,
-            prompt_text=summary_prompt,
-            retries=3,
+    batches = [
+        pending_items[start:start + batch_size]
+        for start in range(0, len(pending_items), batch_size)
+    ]
+
+    async def summarize_one(index, item):
+        async with semaphore:
+            print(
+                f"🧩 1차 요약 진행(개별): "
+                f"{index}/{len(items)}"
+            )
+
+            summary_text = await generate_with_retry_async(
+                client=client,
+                model_name=model_name,
+                prompt_text=build_summary_prompt(item),
 
-            # 개별 항목 하나의 요약이므로
-            # 지나치게 긴 출력을 방지합니다.
-            max_output_tokens=1600,
+                # 개별 항목 하나의 요약이므로
+                # 지나치게 긴 출력을 방지합니다.
+                max_output_tokens=1600,
 
-            # 사실 중심의 비교적 일정한 결과를 위해
-            # 낮은 temperature를 사용합니다.
-            temperature=0.1,
+                # 사실 중심의 비교적 일정한 결과를 위해
+                # 낮은 temperature를 사용합니다.
+                temperature=0.1,
+            )
+
+        save_cache(
+            get_summary_cache_path(model_name, item),
+            summary_text,
         )
 
-        summaries.append(
-            {
-                "idx": index,
-                "type": item["type"],
-                "title": item["title"],
-                "link": item["link"],
-                "summary_text": summary_text,
-            }
+        return to_summary(index, item, summary_text)
+
+    async def summarize_batch(batch):
+        first_index = batch[0][0]
+        last_index = batch[-1][0]
+
+        async with semaphore:
+            print(
+                f"🧩 1차 요약 진행: "
+                f"{first_index}~{last_index}/{len(items)}"
+            )
+
+            response_text = await generate_with_retry_async(
+                client=client,
+                model_name=model_name,
+                prompt_text=build_batch_prompt(batch),
+
+                # 항목 하나당 개별 요약과 같은 출력 한도를 배정합니다.
+                max_output_tokens=1600 * len(batch),
+
+                temperature=0.1,
+            )
+
+        # JSON으로 읽을 수 없거나 배열·객체 구조가 아니면
+        # 묶음 전체를 한 건씩 요약합니다.
+        try:
+            parsed = parse_json_response(response_text)
+
+            if not (
+                isinstance(parsed, list)
+                and all(isinstance(entry, dict) for entry in parsed)
+            ):
+                raise ValueError(
+                    "JSON 객체 배열 형식이 아닙니다."
+                )
+
+        except ValueError as error:
+            print(
+                f"⚠️ 묶음 요약 JSON 해석 실패"
+                f"({first_index}~{last_index}): {error}"
+            )
+            print(
+                "➡️ 해당 묶음을 한 건씩 요약합니다."
+            )
+
+            return await asyncio.gather(
+                *[
+                    summarize_one(index, item)
+                    for index, item in batch
+                ]
+            )
+
+        # summary_text가 null이거나 비어 있거나 문자열이 아닌 항목,
+        # idx가 올바르지 않은 항목은 누락된 것으로 봅니다.
+        summary_by_idx = {}
+
+        for entry in parsed:
+            summary_text = entry.get("summary_text")
+
+            try:
+                index = int(entry.get("idx"))
+            except (TypeError, ValueError):
+                continue
+
+            if isinstance(summary_text, str) and summary_text.strip():
+                summary_by_idx[index] = summary_text.strip()
+
+        summaries = []
+        missing_items = []
+
+        for index, item in batch:
+            if index not in summary_by_idx:
+                missing_items.append((index, item))
+                continue
+
+            save_cache(
+                get_summary_cache_path(model_name, item),
+                summary_by_idx[index],
+            )
+
+            summaries.append(
+                to_summary(index, item, summary_by_idx[index])
+            )
+
+        # 정상적으로 받은 요약은 그대로 사용하고
+        # 누락된 항목만 한 건씩 다시 요약합니다.
+        if missing_items:
+            print(
+                f"⚠️ 묶음 요약 누락 ITEM: "
+                f"{[index for index, _ in missing_items]}"
+            )
+            print(
+                "➡️ 누락된 항목만 한 건씩 요약합니다."
+            )
+
+            summaries.extend(
+                await asyncio.gather(
+                    *[
+                        summarize_one(index, item)
+                        for index, item in missing_items
+                    ]
+                )
+            )
+
+        return sorted(
+            summaries,
+            key=lambda summary: summary["idx"],
         )
 
-    return summaries
+    # asyncio.gather()는 전달한 순서대로 결과를 반환합니다.
+    batch_results = await asyncio.gather(
+        *[
+            summarize_batch(batch)
+            for batch in batches
+        ]
+    )
+
+    summaries = cached_summaries + [
+        summary
+        for batch_summaries in batch_results
+        for summary in batch_summaries
+    ]
+
+    return sorted(
+        summaries,
+        key=lambda summary: summary["idx"],
+    )
 
 
 # ---------------------------------------------------------
 # 7) Reduce: 최종 리포트 생성
 # ---------------------------------------------------------
-def build_report_prompt(
+def build_report_context(
     target_date: str,
     generated_time_kst: str,
     items,
-    all_summaries_text: str,
 ):
     """
-    개별 요약과 실제 원문 URL을 결합하여
-    최종 리포트 생성 프롬프트를 만듭니다.
+    최종 리포트 프롬프트에 공통으로 들어가는
+    채워진 템플릿과 코드에서 생성한 원문 목록을 만듭니다.
+
+    2단계(Map → Reduce) 방식과 단일 호출 방식이
+    같은 템플릿과 원문 목록을 사용하도록 한곳에서 생성합니다.
     """
     (
         news_index_text,
         paper_index_text,
+        news_count,
+        paper_count,
     ) = build_raw_index(items)
 
-    news_count = sum(
-        1
-        for item in items
-        if item.get("type") == "news"
-    )
-
-    paper_count = sum(
-        1
-        for item in items
-        if item.get("type") == "paper"
-    )
-
     template_filled = REPORT_TEMPLATE.format(
         target_date=target_date,
         generated_time_kst=generated_time_kst,
@@ -741,55 +1568,111 @@ def build_report_prompt(
         paper_n=paper_count,
     )
 
+    raw_index_text = f"""
+## 원문 목록 (Raw Index)
+
+### 뉴스
+{news_index_text if news_index_text else "- (수집된 뉴스 없음)"}
+
+### 논문
+{paper_index_text if paper_index_text else "- (수집된 논문 없음)"}
+""".strip()
+
+    return template_filled, raw_index_text
+
+
+def build_report_prompt(
+    target_date: str,
+    generated_time_kst: str,
+    items,
+    all_summaries_text: str,
+):
+    """
+    개별 요약과 실제 원문 URL을 결합하여
+    최종 리포트 생성 프롬프트를 만듭니다.
+    """
+    (
+        template_filled,
+        raw_index_text,
+    ) = build_report_context(
+        target_date=target_date,
+        generated_time_kst=generated_time_kst,
+        items=items,
+    )
+
     report_prompt = f"""
 너는 IT 전문 뉴스 큐레이터이자 시니어 개발자다.
 
 아래 구조화 요약과 원문 목록만 근거로
 지정된 형식의 마크다운 리포트를 작성하라.
 
-[출력 규칙]
-1. 아래 템플릿의 섹션과 헤더 이름을 그대로 사용한다.
+{REPORT_RULES}
 
-2. 오늘의 Top 이슈는
-   수집된 자료 중 3~5개를 선정한다.
+[반드시 이 템플릿 형식으로 출력]
+{template_filled}
 
-3. 동일한 자료를 여러 이슈에서 반복하지 않는다.
+[구조화 요약]
+{all_summaries_text}
 
-4. 각 이슈는 반드시 다음 구조를 포함한다.
-   - 요약: 불릿 3~5개
-   - 개발자 관점 한 줄 평: 1문장
-   - 지금 바로 적용 아이디어: 1~3개
-   - 리스크/주의: 1~2개
-   - 참고 링크: 실제 원문 링크 1~2개
+[코드에서 생성한 원문 목록]
+{raw_index_text}
+""".strip()
 
-5. 마지막에 반드시 다음 섹션을 포함한다.
-   - 오늘의 실무 액션 3가지
-   - 원문 목록 (Raw Index)
+    return report_prompt
 
-6. 한국어로만 작성한다.
 
-7. 자료에 없는 사실을 추측하거나 과장하지 않는다.
+def build_one_shot_prompt(
+    target_date: str,
+    generated_time_kst: str,
+    items,
+):
+    """
+    개별 요약 단계 없이 수집한 원문 자료를 그대로 전달하여
+    최종 리포트를 한 번에 생성하는 프롬프트를 만듭니다.
 
-8. URL을 수정하거나 새로 만들지 않는다.
+    자료 수가 적을 때는 Map → Reduce 두 번의 왕복 대신
+    한 번의 호출로 같은 형식의 리포트를 만들 수 있습니다.
+    """
+    (
+        template_filled,
+        raw_index_text,
+    ) = build_report_context(
+        target_date=target_date,
+        generated_time_kst=generated_time_kst,
+        items=items,
+    )
 
-9. 뉴스 또는 논문이 없는 경우
-   해당 Raw Index에
-   '(수집된 항목 없음)'이라고 표시한다.
+    items_text = "\n\n".join(
+        f"""
+[자료 {index}]
+[타입] {item['type']}
+[제목] {item['title']}
+[본문]
+{item['body']}
+[링크] {item['link']}
+""".strip()
+        for index, item in enumerate(
+            items,
+            start=1,
+        )
+    )
+
+    report_prompt = f"""
+너는 IT 전문 뉴스 큐레이터이자 시니어 개발자다.
+
+아래 수집 자료와 원문 목록만 근거로
+지정된 형식의 마크다운 리포트를 작성하라.
+
+{REPORT_RULES}
 
 [반드시 이 템플릿 형식으로 출력]
 {template_filled}
 
-[구조화 요약]
-{all_summaries_text}
+[수집 자료]
+{items_text}
 
 [코드에서 생성한 원문 목록]
-## 원문 목록 (Raw Index)
-
-### 뉴스
-{news_index_text if news_index_text else "- (수집된 뉴스 없음)"}
-
-### 논문
-{paper_index_text if paper_index_text else "- (수집된 논문 없음)"}
+{raw_index_text}
 """.strip()
 
     return report_prompt
@@ -799,18 +1682,21 @@ def reduce_report(
     client,
     model_name: str,
     report_prompt: str,
+    stream_path: Path,
 ) -> str:
     """
     구조화된 개별 요약을 기반으로
     최종 AI 기술 동향 리포트를 생성합니다.
+
+    생성 중인 내용은 stream_path에 스트리밍으로 기록합니다.
     """
     print("📰 2차 리포트 생성 시작")
 
-    return generate_with_retry(
+    return generate_stream_with_retry(
         client=client,
         model_name=model_name,
         prompt_text=report_prompt,
-        retries=3,
+        stream_path=stream_path,
 
         # 최종 보고서는 길어질 수 있으므로
         # 개별 요약보다 큰 출력 제한을 사용합니다.
@@ -820,16 +1706,67 @@ def reduce_report(
     )
 
 
+def one_shot_report(
+    client,
+    model_name: str,
+    report_prompt: str,
+    stream_path: Path,
+) -> str:
+    """
+    수집한 원문 자료를 기반으로
+    최종 AI 기술 동향 리포트를 한 번의 호출로 생성합니다.
+
+    생성 중인 내용은 stream_path에 스트리밍으로 기록합니다.
+    """
+    print("📰 단일 호출 리포트 생성 시작")
+
+    return generate_stream_with_retry(
+        client=client,
+        model_name=model_name,
+        prompt_text=report_prompt,
+        stream_path=stream_path,
+        max_output_tokens=8192,
+        temperature=0.2,
+    )
+
+
 # ---------------------------------------------------------
 # 8) main
 # ---------------------------------------------------------
-def main():
+def parse_args(argv=None):
+    """
+    명령행 인자를 읽습니다.
+
+    --two-phase:
+        자료 수와 관계없이 개별 요약(Map) 후
+        최종 리포트(Reduce)를 생성하는 2단계 방식을 사용합니다.
+        프롬프트 길이 여유가 적을 때 사용합니다.
+    """
+    parser = argparse.ArgumentParser(
+        description="KST 기준 전날의 AI 기술 동향 보고서를 생성합니다.",
+    )
+
+    parser.add_argument(
+        "--two-phase",
+        action="store_true",
+        help="개별 요약 후 최종 리포트를 생성하는 2단계 방식을 사용합니다.",
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(two_phase: bool = False):
     """
     KST 기준 전날의 AI 기술 동향 보고서를 생성합니다.
 
+    수집한 자료가 ONE_SHOT_MAX_ITEMS 이하이면
+    한 번의 Gemini 호출로 리포트를 생성하고,
+    그보다 많거나 two_phase가 True이면
+    개별 요약(Map) 후 최종 리포트(Reduce)를 생성합니다.
+
     생성 파일:
     - reports/YYYY-MM-DD_AI_Report.md
-    - reports/YYYY-MM-DD_summaries.json
+    - reports/YYYY-MM-DD_summaries.json (2단계 방식에서만 생성)
     """
     kst = timezone(
         timedelta(hours=9)
@@ -864,16 +1801,29 @@ def main():
         / f"{target_date}_summaries.json"
     )
 
-    # 보고서와 요약 파일이 모두 존재하면
+    # 최종 리포트를 스트리밍으로 받는 동안 기록하는 임시 파일입니다.
+    # 완성된 리포트는 검증 후 report_path에 저장하므로,
+    # 생성 도중 실패해도 불완전한 리포트가 완료된 것으로 취급되지 않습니다.
+    stream_path = (
+        reports_dir
+        / f"{target_date}_AI_Report.md.partial"
+    )
+
+    # 이미 생성된 결과가 있으면
     # API 호출과 외부 검색을 수행하지 않고 종료합니다.
+    #
+    # 단일 호출 방식은 개별 요약 파일을 만들지 않으므로 리포트만,
+    # 2단계 방식은 리포트와 요약 파일을 모두 확인합니다.
     if (
         report_path.exists()
-        and summary_path.exists()
+        and (
+            not two_phase
+            or summary_path.exists()
+        )
     ):
         print(
             f"⏭️ 이미 생성됨: "
-            f"{report_path.name}, "
-            f"{summary_path.name} → 종료"
+            f"{report_path.name} → 종료"
         )
         return
 
@@ -909,97 +1859,133 @@ def main():
         # -------------------------------------------------
         # 1. 뉴스와 논문 수집
         # -------------------------------------------------
-        items = collect_items(
-            target_date=target_date,
-            news_n=5,
-            paper_n=5,
+        items = asyncio.run(
+            collect_items_async(
+                target_date=target_date,
+                news_n=5,
+                paper_n=5,
+            )
         )
 
-        news_count = sum(
-            1
-            for item in items
-            if item.get("type") == "news"
-        )
-
-        paper_count = sum(
-            1
-            for item in items
-            if item.get("type") == "paper"
-        )
+        # 리포트 템플릿과 같은 기준으로 세도록
+        # build_raw_index()의 개수를 그대로 사용합니다.
+        (
+            _,
+            _,
+            news_count,
+            paper_count,
+        ) = build_raw_index(items)
 
         print(
             f"✅ 수집 완료: 총 {len(items)}건 "
             f"(뉴스 {news_count}, 논문 {paper_count})"
         )
 
-        # -------------------------------------------------
-        # 2. 개별 자료 구조화 요약
-        # -------------------------------------------------
-        summaries = map_summaries(
-            client=gemini_client,
-            model_name=model_name,
-            items=items,
+        # 자료가 적으면 Map → Reduce 두 번의 왕복 대신
+        # 한 번의 호출로 최종 리포트를 생성합니다.
+        use_two_phase = (
+            two_phase
+            or len(items) > ONE_SHOT_MAX_ITEMS
         )
 
-        # 개별 요약 결과를 JSON으로 저장합니다.
-        summary_path.write_text(
-            json.dumps(
-                summaries,
-                ensure_ascii=False,
-                indent=2,
-            ),
-            encoding="utf-8",
-        )
+        if use_two_phase:
+            # ---------------------------------------------
+            # 2. 개별 자료 구조화 요약
+            # ---------------------------------------------
+            # 자료를 묶음 단위로 요약하고, 묶음끼리는
+            # 이벤트 루프에서 동시에 실행합니다.
+            summaries = asyncio.run(
+                map_summaries_async(
+                    client=gemini_client,
+                    model_name=model_name,
+                    items=items,
+                    max_concurrent_calls=MAX_CONCURRENT_CALLS,
+                )
+            )
 
-        print(
-            f"💾 요약 저장: {summary_path}"
-        )
+            # 개별 요약 결과를 JSON으로 저장합니다.
+            # 단일 호출 방식에는 개별 요약이 없으므로 저장하지 않습니다.
+            write_text_atomic(
+                summary_path,
+                json.dumps(
+                    summaries,
+                    ensure_ascii=False,
+                    indent=2,
+                ),
+            )
+
+            print(
+                f"💾 요약 저장: {summary_path}"
+            )
 
         # -------------------------------------------------
         # 3. 최종 리포트 생성
         # -------------------------------------------------
-        all_summaries_text = "\n\n".join(
-            summary["summary_text"]
-            for summary in summaries
-        )
+        if use_two_phase:
+            all_summaries_text = "\n\n".join(
+                summary["summary_text"]
+                for summary in summaries
+            )
 
-        report_prompt = build_report_prompt(
-            target_date=target_date,
-            generated_time_kst=generated_time_kst,
-            items=items,
-            all_summaries_text=all_summaries_text,
-        )
+            report_prompt = build_report_prompt(
+                target_date=target_date,
+                generated_time_kst=generated_time_kst,
+                items=items,
+                all_summaries_text=all_summaries_text,
+            )
 
-        report_text = reduce_report(
-            client=gemini_client,
-            model_name=model_name,
-            report_prompt=report_prompt,
-        )
+            report_text = reduce_report(
+                client=gemini_client,
+                model_name=model_name,
+                report_prompt=report_prompt,
+                stream_path=stream_path,
+            )
+
+        else:
+            report_prompt = build_one_shot_prompt(
+                target_date=target_date,
+                generated_time_kst=generated_time_kst,
+                items=items,
+            )
+
+            report_text = one_shot_report(
+                client=gemini_client,
+                model_name=model_name,
+                report_prompt=report_prompt,
+                stream_path=stream_path,
+            )
 
         # -------------------------------------------------
         # 4. 포맷 누락 또는 출력 중단 검사
         # -------------------------------------------------
-        missing_headers = validate_report_format(
-            report_text
-        )
+        # 검증을 통과하면 즉시 멈추고,
+        # 이어쓰기 결과도 끊긴 경우에만 한 번 더 시도합니다.
+        for attempt in range(1, MAX_CONTINUATIONS + 1):
+            missing_headers = validate_report_format(
+                report_text
+            )
+
+            if (
+                not missing_headers
+                and not looks_truncated(report_text)
+            ):
+                break
 
-        if (
-            missing_headers
-            or looks_truncated(report_text)
-        ):
             print(
                 "⚠️ 포맷 누락 또는 출력 중단 의심: "
                 f"{missing_headers if missing_headers else '(헤더 누락 없음)'}"
             )
 
             print(
-                "➡️ 이어쓰기 1회 시도"
+                f"➡️ 이어쓰기 시도 "
+                f"({attempt}/{MAX_CONTINUATIONS})"
             )
 
             report_text = continue_report(
                 client=gemini_client,
                 model_name=model_name,
                 existing_text=report_text,
+                tail_chars=CONTINUE_TAIL_CHARS * (2 ** (attempt - 1)),
             )
 
         final_missing_headers = (
@@ -1019,9 +2005,13 @@ def main():
         # -------------------------------------------------
         # 5. 최종 리포트 저장
         # -------------------------------------------------
-        report_path.write_text(
+        write_text_atomic(
+            report_path,
             report_text.rstrip() + "\n",
-            encoding="utf-8",
+        )
+
+        stream_path.unlink(
+            missing_ok=True,
         )
 
         print(
@@ -1037,4 +2027,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+
+    main(
+        two_phase=args.two_phase,
+    )
\ No newline at end of file
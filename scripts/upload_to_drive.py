@@ -1,4 +1,7 @@
 import os, json
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 
@@ -7,31 +10,61 @@ from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 
 SCOPES = ["https://www.googleapis.com/auth/drive.file"]
+MAX_UPLOAD_WORKERS = 4
 
-def get_drive_service():
+# 이 크기 이하의 파일은 resumable 세션 없이 multipart 요청 한 번으로 업로드
+RESUMABLE_THRESHOLD_BYTES = 5_000_000
+MIME_TYPES = {".md": "text/markdown", ".json": "application/json"}
+
+# googleapiclient의 httplib2 연결은 스레드 안전하지 않으므로 스레드마다 서비스를 따로 둠
+_thread_local = threading.local()
+
+@functools.lru_cache(maxsize=1)
+def get_credentials():
+    # 토큰 JSON은 프로세스당 한 번만 파싱하고, 스레드별 서비스가 같은 자격 증명을 공유
+    # (서비스 계정은 Drive 저장 용량이 없어 내 드라이브 폴더에 업로드할 수 없으므로 OAuth 토큰만 사용)
     token_json = os.environ.get("GDRIVE_OAUTH_TOKEN_JSON")
     if not token_json:
         raise RuntimeError("GDRIVE_OAUTH_TOKEN_JSON이 없습니다. GitHub Secrets에 추가하세요.")
-    creds = Credentials.from_authorized_user_info(json.loads(token_json), scopes=SCOPES)
-    return build("drive", "v3", credentials=creds)
+    return Credentials.from_authorized_user_info(json.loads(token_json), scopes=SCOPES)
 
-def file_exists_in_folder(service, folder_id: str, file_name: str):
-    q = f"'{folder_id}' in parents and name = '{file_name}' and trashed = false"
-    res = service.files().list(q=q, fields="files(id,name)").execute()
-    files = res.get("files", [])
-    return (files[0]["id"] if files else None)
+def get_drive_service():
+    # 패키지에 포함된 discovery 문서를 사용해 네트워크 조회 없이 클라이언트 생성
+    return build("drive", "v3", credentials=get_credentials(), static_discovery=True, cache_discovery=False)
 
-def upload_if_not_exists(service, folder_id: str, local_path: Path):
-    file_name = local_path.name
-    existed_id = file_exists_in_folder(service, folder_id, file_name)
-    if existed_id:
-        return "skipped", file_name
+def get_thread_drive_service():
+    service = getattr(_thread_local, "service", None)
+    if service is None:
+        service = get_drive_service()
+        _thread_local.service = service
+    return service
+
+def _escape_query_value(value: str):
+    # Drive 검색 쿼리 문자열 리터럴 안의 역슬래시·작은따옴표 이스케이프
+    return value.replace("\\", "\\\\").replace("'", "\\'")
 
-    media = MediaFileUpload(str(local_path), resumable=True)
+def list_existing_names(service, folder_id: str, file_names):
+    # 여러 파일의 존재 여부를 files.list 한 번으로 확인 (하루 몇 개 파일이라 쿼리 길이 제한에 걸리지 않음)
+    name_clause = " or ".join(f"name = '{_escape_query_value(name)}'" for name in file_names)
+    q = f"'{folder_id}' in parents and trashed = false and ({name_clause})"
+    res = service.files().list(q=q, fields="files(name)", pageSize=1000).execute()
+    return {f["name"] for f in res.get("files", [])}
+
+def make_media(local_path: Path):
+    resumable = local_path.stat().st_size > RESUMABLE_THRESHOLD_BYTES
+    mimetype = MIME_TYPES.get(local_path.suffix.lower())
+    return MediaFileUpload(str(local_path), mimetype=mimetype, resumable=resumable)
+
+def upload_file(service, folder_id: str, local_path: Path):
+    file_name = local_path.name
+    media = make_media(local_path)
     metadata = {"name": file_name, "parents": [folder_id]}
     service.files().create(body=metadata, media_body=media, fields="id").execute()
     return "created", file_name
 
+def upload_in_worker(folder_id: str, local_path: Path):
+    return upload_file(get_thread_drive_service(), folder_id, local_path)
+
 def main():
     folder_id = os.environ.get("GDRIVE_FOLDER_ID")
     if not folder_id:
@@ -50,18 +83,27 @@ def main():
         reports_dir / f"{target_date}_AI_Report.md",
         reports_dir / f"{target_date}_summaries.json",
     ]
+    # 요약 파일은 2단계 방식(--two-phase)에서만 생성되므로 존재하는 파일만 업로드
     targets = [p for p in targets if p.exists()]
 
     if not targets:
         print(f"⏭️ 업로드할 파일 없음 ({target_date}) → 종료")
         return
 
-    service = get_drive_service()
-
     print(f"📤 Drive 업로드 시작: {len(targets)}개 파일 ({target_date})")
+    existing = list_existing_names(get_thread_drive_service(), folder_id, [p.name for p in targets])
     for p in targets:
-        status, name = upload_if_not_exists(service, folder_id, p)
-        print(f" - {status}: {name}")
+        if p.name in existing:
+            print(f" - skipped: {p.name}")
+    missing = [p for p in targets if p.name not in existing]
+
+    # 파일별 업로드는 서로 독립적인 요청이므로 동시에 진행
+    # (Drive 배치 요청(new_batch_http_request)은 미디어 업로드를 지원하지 않아 개별 요청을 병렬로 보냄)
+    with ThreadPoolExecutor(max_workers=MAX_UPLOAD_WORKERS) as executor:
+        futures = [executor.submit(upload_in_worker, folder_id, p) for p in missing]
+        for future in as_completed(futures):
+            status, name = future.result()
+            print(f" - {status}: {name}")
 
     print("✅ Drive 미러링 완료")
 